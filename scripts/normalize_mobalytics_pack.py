@@ -18,38 +18,122 @@ Also writes:
 from __future__ import annotations
 
 import argparse
-import json
+import functools
 import re
+import sys
 from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Dict, List, Tuple, Set
 
+# Ensure repo root is on PYTHONPATH so `import tft_advisor` works when run as a script
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from tft_advisor._json import dumps, loads
+
 
 # --- helpers ---------------------------------------------------------------
 
-_ID_RE = re.compile(r"[^a-z0-9]+")
+# bytes.translate table: keep [a-z0-9], everything else becomes "_"
+_ID_TABLE = bytes(c if (48 <= c <= 57 or 97 <= c <= 122) else 0x5F for c in range(256))
+_MULTI_US_RE = re.compile(rb"_+")
 
+@functools.lru_cache(maxsize=8192)
 def slug_to_id(slug: str) -> str:
     """Convert hyphenated/odd slugs into schema-safe snake_case ids."""
-    s = (slug or "").strip().lower()
-    s = _ID_RE.sub("_", s).strip("_")
+    # non-ASCII chars become "?" and then "_", same as the old [^a-z0-9]+ regex
+    b = (slug or "").strip().lower().encode("ascii", "replace").translate(_ID_TABLE)
     # collapse multiple underscores
-    s = re.sub(r"_+", "_", s)
+    s = _MULTI_US_RE.sub(b"_", b).strip(b"_").decode("ascii")
     if not s:
         raise ValueError(f"Cannot normalize empty slug: {slug!r}")
     return s[:64]
 
 
+def _mid(id_map: Dict[str, str], raw_slug: str) -> str:
+    """id_map lookup that only calls slug_to_id on a miss (setdefault would always call it)."""
+    nid = id_map.get(raw_slug)
+    if nid is None:
+        nid = id_map[raw_slug] = slug_to_id(raw_slug)
+    return nid
+
+
 def now_utc_iso_z() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
 def read_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
+    return loads(path.read_bytes())
 
 
 def write_json(path: Path, obj: Any) -> None:
-    path.write_text(json.dumps(obj, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    path.write_bytes(dumps(obj))
+
+
+_RAW_ARRAYS = ("items", "champions", "synergies")
+
+
+def read_raw_arrays(raw_path: Path) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Return {"items": [...], "champions": [...], "synergies": [...]} from data.json.
+
+    With ijson installed (it picks the yajl2_c backend when available) the file is
+    streamed in a single pass and only these three arrays are ever materialized;
+    otherwise we fall back to a full read_json().
+    """
+    try:
+        import ijson  # pip install ijson (optional)
+    except ImportError:
+        root = read_json(raw_path).get("data") or {}
+        return {k: root.get(k) or [] for k in _RAW_ARRAYS}
+
+    out: Dict[str, List[Dict[str, Any]]] = {k: [] for k in _RAW_ARRAYS}
+    targets = {f"data.{k}.item": out[k] for k in _RAW_ARRAYS}
+
+    with raw_path.open("rb") as f:
+        events = ijson.parse(f, use_float=True)
+        for prefix, event, value in events:
+            target = targets.get(prefix)
+            if target is None:
+                continue
+            if event not in ("start_map", "start_array"):
+                target.append(value)
+                continue
+            # Build this element from its own events only, then resume skipping.
+            builder = ijson.ObjectBuilder()
+            item_prefix = prefix
+            end_event = "end" + event[len("start"):]
+            while True:
+                builder.event(event, value)
+                prefix, event, value = next(events)
+                if prefix == item_prefix and event == end_event:
+                    break
+            target.append(builder.value)
+
+    return out
+
+
+# (substring, tag) pairs checked against each bonusStats slug, in one pass.
+# Redundant needles ("critical", "magic-resist", "attack-damage", "spell-damage") are
+# already covered by "crit", "resist" and "damage".
+_BONUS_STAT_TAG_RULES: Tuple[Tuple[str, str], ...] = (
+    # speed
+    ("attack-speed", "attack_speed"),
+    ("attack_speed", "attack_speed"),
+    # mana
+    ("mana", "mana"),
+    # tanky stats
+    ("health", "tank"),
+    ("armor", "tank"),
+    ("mr", "tank"),
+    ("resist", "tank"),
+    # damage stats (AD/AP/crit etc. all become "damage" at this layer)
+    ("crit", "damage"),
+    ("damage", "damage"),
+)
+_ALL_BONUS_STAT_TAGS = frozenset(tag for _, tag in _BONUS_STAT_TAG_RULES)
 
 
 def pick_item_effect_tags_from_bonus_stats(bonus_stats: List[Dict[str, Any]], *, fallback: str) -> List[str]:
@@ -61,18 +145,11 @@ def pick_item_effect_tags_from_bonus_stats(bonus_stats: List[Dict[str, Any]], *,
 
     for bs in bonus_stats or []:
         slug = (bs.get("slug") or "").lower()
-        # speed
-        if "attack-speed" in slug or "attack_speed" in slug:
-            tags.add("attack_speed")
-        # mana
-        if "mana" in slug:
-            tags.add("mana")
-        # tanky stats
-        if any(k in slug for k in ["health", "armor", "magic-resist", "mr", "resist"]):
-            tags.add("tank")
-        # damage stats (AD/AP/crit etc. all become "damage" at this layer)
-        if any(k in slug for k in ["attack-damage", "spell-damage", "crit", "critical", "damage"]):
-            tags.add("damage")
+        for needle, tag in _BONUS_STAT_TAG_RULES:
+            if tag not in tags and needle in slug:
+                tags.add(tag)
+        if len(tags) == len(_ALL_BONUS_STAT_TAGS):
+            break
 
     if not tags:
         tags.add(fallback)
@@ -119,7 +196,7 @@ def normalize_traits(raw_synergies: List[Dict[str, Any]], id_map: Dict[str, str]
         raw_slug = fd.get("slug")
         if not raw_slug:
             continue
-        tid = id_map.setdefault(raw_slug, slug_to_id(raw_slug))
+        tid = _mid(id_map, raw_slug)
         traits.append({
             "id": tid,
             "name": fd.get("name") or raw_slug,
@@ -128,7 +205,7 @@ def normalize_traits(raw_synergies: List[Dict[str, Any]], id_map: Dict[str, str]
             "notes": fd.get("type") or ""
         })
     # stable sort
-    traits.sort(key=lambda x: x["id"])
+    traits.sort(key=itemgetter("id"))
     return traits
 
 
@@ -137,33 +214,29 @@ def normalize_items(raw_items: List[Dict[str, Any]], id_map: Dict[str, str]) ->
     Returns:
       (normalized_items, base_component_ids)
     """
-    # Identify base components by scanning all buildsFrom references
+    # Single walk over raw_items: unwrap flatData/buildsFrom once, and identify base
+    # components by collecting every buildsFrom reference along the way.
     referenced_slugs: Set[str] = set()
+    parsed: List[Tuple[Dict[str, Any], str, List[str]]] = []
     for it in raw_items:
         fd = it.get("flatData") or {}
+        comp_slugs: List[str] = []
         for bf in fd.get("buildsFrom") or []:
-            bffd = bf.get("flatData") or {}
-            if bffd.get("slug"):
-                referenced_slugs.add(bffd["slug"])
+            bslug = (bf.get("flatData") or {}).get("slug")
+            if bslug:
+                comp_slugs.append(bslug)
+        referenced_slugs.update(comp_slugs)
+        raw_slug = fd.get("slug")
+        if raw_slug:
+            parsed.append((fd, raw_slug, comp_slugs))
 
-    base_component_ids: Set[str] = {id_map.setdefault(s, slug_to_id(s)) for s in referenced_slugs}
+    base_component_ids: Set[str] = {_mid(id_map, s) for s in referenced_slugs}
 
     out: List[Dict[str, Any]] = []
 
-    for it in raw_items:
-        fd = it.get("flatData") or {}
-        raw_slug = fd.get("slug")
-        if not raw_slug:
-            continue
-        iid = id_map.setdefault(raw_slug, slug_to_id(raw_slug))
-
-        builds_from = fd.get("buildsFrom") or []
-        component_ids: List[str] = []
-        for bf in builds_from:
-            bffd = bf.get("flatData") or {}
-            bslug = bffd.get("slug")
-            if bslug:
-                component_ids.append(id_map.setdefault(bslug, slug_to_id(bslug)))
+    for fd, raw_slug, comp_slugs in parsed:
+        iid = _mid(id_map, raw_slug)
+        component_ids: List[str] = [_mid(id_map, s) for s in comp_slugs]
 
         kind = "completed" if len(component_ids) == 2 else ("component" if iid in base_component_ids else "artifact")
 
@@ -194,7 +267,7 @@ def normalize_items(raw_items: List[Dict[str, Any]], id_map: Dict[str, str]) ->
             "unique": False
         })
 
-    out.sort(key=lambda x: x["id"])
+    out.sort(key=itemgetter("id"))
     return out, base_component_ids
 
 
@@ -206,16 +279,14 @@ def normalize_champions(raw_champions: List[Dict[str, Any]], id_map: Dict[str, s
         raw_slug = fd.get("slug")
         if not raw_slug:
             continue
-        cid = id_map.setdefault(raw_slug, slug_to_id(raw_slug))
+        cid = _mid(id_map, raw_slug)
 
         # synergies: list of { flatData: { slug, name, ... } }
-        traits: List[str] = []
-        for syn in fd.get("synergies") or []:
-            sfd = syn.get("flatData") or {}
-            sslug = sfd.get("slug")
-            if sslug:
-                traits.append(id_map.setdefault(sslug, slug_to_id(sslug)))
-        traits = sorted(set(traits))
+        traits = sorted({
+            _mid(id_map, sslug)
+            for syn in fd.get("synergies") or []
+            if (sslug := (syn.get("flatData") or {}).get("slug"))
+        })
 
         # schema requires at least 1 role tag; default to flex until curated
         out.append({
@@ -237,7 +308,7 @@ def normalize_champions(raw_champions: List[Dict[str, Any]], id_map: Dict[str, s
             }
         })
 
-    out.sort(key=lambda x: x["id"])
+    out.sort(key=itemgetter("id"))
     return out
 
 
@@ -253,11 +324,10 @@ def main() -> None:
     if not raw_path.exists():
         raise SystemExit(f"Missing raw data.json at: {raw_path}")
 
-    raw = read_json(raw_path)
-    root = raw.get("data") or {}
-    raw_items = root.get("items") or []
-    raw_champions = root.get("champions") or []
-    raw_synergies = root.get("synergies") or []
+    raw = read_raw_arrays(raw_path)
+    raw_items = raw["items"]
+    raw_champions = raw["champions"]
+    raw_synergies = raw["synergies"]
 
     id_map: Dict[str, str] = {}
 
@@ -293,7 +363,7 @@ def main() -> None:
 
     # Helpful mapping file for debugging/template-writing
     write_json(pack_dir / "raw" / "id_map.json", {
-        "raw_slug_to_id": dict(sorted(id_map.items(), key=lambda kv: kv[0])),
+        "raw_slug_to_id": dict(sorted(id_map.items(), key=itemgetter(0))),
         "base_component_ids": sorted(base_components)
     })
 
@@ -8,23 +8,74 @@ Validate a normalized pack:
 from __future__ import annotations
 
 import argparse
-import json
+import sys
 from pathlib import Path
-from typing import Any, Dict, List, Set, Tuple
+from typing import Any, Callable, Dict, List, Set, Tuple
 
-from jsonschema import validate  # pip install jsonschema
+import fastjsonschema  # pip install fastjsonschema
+
+# Ensure repo root is on PYTHONPATH so `import tft_advisor` works when run as a script
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from tft_advisor._json import loads
+
+try:
+    import jsonschema_rs  # pip install jsonschema-rs (optional, native validator)
+except ImportError:  # pragma: no cover - depends on installed extras
+    jsonschema_rs = None
+
+# A validator returns None on success and raises ValueError("at <path>: <message>")
+Validator = Callable[[Any], None]
+
+# schema path -> compiled validator, so repeated calls in one process skip recompiling
+_VALIDATORS: Dict[Path, Validator] = {}
 
 
 def read_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8-sig"))
+    # bytes straight into orjson (when installed); loads() strips the BOM our schemas carry
+    return loads(path.read_bytes())
+
+
+def compile_schema(schema: Dict[str, Any]) -> Validator:
+    """Prefer the Rust jsonschema-rs validator; fall back to fastjsonschema's generated code."""
+    if jsonschema_rs is not None:
+        rs_validator = jsonschema_rs.validator_for(schema)
+
+        def validate_rs(data: Any) -> None:
+            # is_valid() is the cheap happy path; only collect an error when it fails
+            if not rs_validator.is_valid(data):
+                err = next(iter(rs_validator.iter_errors(data)))
+                raise ValueError(f"at {list(err.instance_path)}: {err.message}")
+
+        return validate_rs
+
+    fjs_validator = fastjsonschema.compile(schema)
+
+    def validate_fjs(data: Any) -> None:
+        try:
+            fjs_validator(data)
+        except fastjsonschema.JsonSchemaValueException as e:
+            raise ValueError(f"at {e.path}: {e.message}") from e
+
+    return validate_fjs
 
 
-def load_schema(schema_path: Path) -> Dict[str, Any]:
-    return read_json(schema_path)
+def load_schema(schema_path: Path) -> Validator:
+    """Compile schema_path once into a validator function."""
+    key = schema_path.resolve()
+    validator = _VALIDATORS.get(key)
+    if validator is None:
+        validator = _VALIDATORS[key] = compile_schema(read_json(schema_path))
+    return validator
 
 
-def schema_validate(data: Any, schema: Dict[str, Any], label: str) -> None:
-    validate(instance=data, schema=schema)
+def schema_validate(data: Any, validator: Validator, label: str) -> None:
+    try:
+        validator(data)
+    except ValueError as e:
+        raise ValueError(f"Schema validation failed for {label} {e}") from e
     print(f"✅ Schema OK: {label}")
 
 
@@ -0,0 +1,48 @@
+"""
+Fast JSON loads/dumps with graceful fallback: orjson -> ujson -> stdlib json.
+
+loads() takes raw UTF-8 bytes (a leading BOM is tolerated) and dumps() returns
+UTF-8 bytes formatted like json.dumps(obj, indent=2, ensure_ascii=False) + "\\n",
+so pack files round-trip identically whichever backend is installed.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+_BOM = b"\xef\xbb\xbf"
+
+try:
+    import orjson
+
+    def _loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+
+except ImportError:  # pragma: no cover - depends on installed extras
+    try:
+        import ujson as _backend
+
+        _DUMP_KW = {"indent": 2, "ensure_ascii": False, "escape_forward_slashes": False}
+    except ImportError:
+        import json as _backend  # type: ignore[no-redef]
+
+        _DUMP_KW = {"indent": 2, "ensure_ascii": False}
+
+    def _loads(data: bytes) -> Any:
+        return _backend.loads(data)
+
+    def _dumps(obj: Any) -> bytes:
+        return (_backend.dumps(obj, **_DUMP_KW) + "\n").encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    if data.startswith(_BOM):
+        data = data[len(_BOM):]
+    return _loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    return _dumps(obj)
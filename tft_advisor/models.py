@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Tuple
+
+
+# Read-only pack records built once by load_pack(). Only the fields the recommender
+# actually reads are kept; the JSON files remain the source of truth for everything else.
+
+@dataclass(frozen=True, slots=True)
+class Trait:
+    id: str
+
+    @classmethod
+    def from_json(cls, d: Dict[str, Any]) -> "Trait":
+        return cls(id=d["id"])
+
+
+@dataclass(frozen=True, slots=True)
+class Champion:
+    id: str
+    trait_idx: Tuple[int, ...]  # positions in pack["trait_index"], for count_traits()
+
+    @classmethod
+    def from_json(cls, d: Dict[str, Any], trait_index: Mapping[str, int]) -> "Champion":
+        return cls(id=d["id"], trait_idx=tuple(trait_index[t] for t in d.get("traits", [])))
+
+
+@dataclass(frozen=True, slots=True)
+class Item:
+    id: str
+    kind: str
+    components: Tuple[str, ...]
+    effect_tags: FrozenSet[str]
+
+    @classmethod
+    def from_json(cls, d: Dict[str, Any]) -> "Item":
+        return cls(
+            id=d["id"],
+            kind=d.get("kind", ""),
+            components=tuple(d.get("components", [])),
+            effect_tags=frozenset(d.get("effect_tags", []) or []),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class TemplateCtx:
+    # carry_plan / holder_rules / required units of one template, for choose_now_holder()
+    primary: Optional[str]
+    tank: Optional[str]
+    utility: Optional[str]
+    secondary: Tuple[str, ...]
+    carry_ph: Tuple[str, ...]
+    tank_ph: Tuple[str, ...]
+    util_ph: Tuple[str, ...]
+    required: Tuple[str, ...]
+
+    @classmethod
+    def from_template(cls, t: Dict[str, Any]) -> "TemplateCtx":
+        carry_plan = t.get("carry_plan", {}) or {}
+        holder_rules = t.get("holder_rules", {}) or {}
+        return cls(
+            primary=carry_plan.get("primary_carry"),
+            tank=carry_plan.get("main_tank"),
+            utility=carry_plan.get("utility_carry"),
+            secondary=tuple(carry_plan.get("secondary_carries", []) or []),
+            carry_ph=tuple(holder_rules.get("carry_placeholders", []) or []),
+            tank_ph=tuple(holder_rules.get("tank_placeholders", []) or []),
+            util_ph=tuple(holder_rules.get("utility_placeholders", []) or []),
+            required=tuple(t.get("units", {}).get("required", [])),
+        )
@@ -1,212 +1,395 @@
 from __future__ import annotations
 
-import json
-from collections import Counter
+import functools
+import heapq
+import itertools
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Optional
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import fastjsonschema  # pip install fastjsonschema
+
+from tft_advisor._json import loads
+from tft_advisor.models import Champion, Item, TemplateCtx, Trait
 
 
 # ---------- IO ----------
 def read_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8-sig"))
+    return loads(path.read_bytes())
 
 
 def load_pack(pack_dir: Path) -> Dict[str, Any]:
     champs = read_json(pack_dir / "champions.json")["champions"]
     items = read_json(pack_dir / "items.json")["items"]
     traits = read_json(pack_dir / "traits.json")["traits"]
+    # dense trait index (also covers traits only referenced by champions) so board trait
+    # counts can live in a flat list; each Champion keeps its traits as index tuples
+    trait_ids = {t["id"] for t in traits}.union(*(c.get("traits", []) for c in champs))
+    trait_index = {tid: i for i, tid in enumerate(sorted(trait_ids))}
+
+    items_by_id = {i["id"]: Item.from_json(i) for i in items}
+    # craftable_items() works on dense component ints: an inventory becomes a small count
+    # list and each recipe is (completed_item_id, comp_a_idx, comp_b_idx, need_b), where
+    # need_b is 2 for doubled-component recipes (e.g. two belts)
+    recipes = [it for it in items_by_id.values() if it.kind == "completed" and len(it.components) == 2]
+    component_index = {cid: i for i, cid in enumerate(sorted({c for it in recipes for c in it.components}))}
+    completed_recipes = []
+    for it in sorted(recipes, key=attrgetter("id")):
+        a, b = (component_index[c] for c in it.components)
+        completed_recipes.append((it.id, a, b, 2 if a == b else 1))
+    champions = {c["id"]: Champion.from_json(c, trait_index) for c in champs}
     return {
-        "champions": {c["id"]: c for c in champs},
-        "items": {i["id"]: i for i in items},
-        "traits": {t["id"]: t for t in traits},
+        "champions": champions,
+        "items": items_by_id,
+        "traits": {t["id"]: Trait.from_json(t) for t in traits},
+        "trait_index": trait_index,
+        "_component_index": component_index,
+        "_completed_recipes": completed_recipes,
+        "_craftable_cache": {},  # sorted inventory tuple -> craftable_items() result
+        # sorted (champion ids, item ids): the allowed-id lists the vision prompt is built from
+        "_allowed_ids": (tuple(sorted(champions)), tuple(sorted(items_by_id))),
     }
 
 
+TEMPLATE_SCHEMA_PATH = Path(__file__).resolve().parents[1] / "docs" / "schemas" / "template.schema.json"
+
+
+@functools.lru_cache(maxsize=1)
+def _template_validator() -> Callable[[Any], Any]:
+    # compiled once per process into a specialised Python validator
+    return fastjsonschema.compile(read_json(TEMPLATE_SCHEMA_PATH))
+
+
+def load_template(path: Path) -> Dict[str, Any]:
+    # schema-checked, so downstream code trusts the shape
+    template = read_json(path)
+    try:
+        _template_validator()(template)
+    except fastjsonschema.JsonSchemaValueException as e:
+        raise ValueError(f"Invalid template {path}: {e.message}") from e
+    # compile pivot triggers at load time so recommend() only ever evaluates them
+    compile_triggers(template)
+    return template
+
+
+def _template_paths(folder: Path) -> List[Path]:
+    # scandir gives us the file type without an extra stat per entry
+    with os.scandir(folder) as entries:
+        return sorted(Path(e.path) for e in entries if e.name.endswith(".json") and e.is_file())
+
+
 def load_templates(path: Path) -> List[Dict[str, Any]]:
     if path.is_file():
-        return [read_json(path)]
+        return [load_template(path)]
     if path.is_dir():
-        return [read_json(p) for p in sorted(path.glob("*.json"))]
+        paths = _template_paths(path)
+        if len(paths) <= 1:
+            return [load_template(p) for p in paths]
+        # I/O-bound: overlap the reads, results keep the sorted path order
+        with ThreadPoolExecutor(max_workers=min(16, len(paths))) as ex:
+            return list(ex.map(load_template, paths))
     raise FileNotFoundError(str(path))
 
 
+# Process-level caches for long-lived callers (UI). Keys include every source file's
+# mtime, so editing/adding/removing a JSON file invalidates the entry automatically.
+# Cached packs/templates are shared between calls and must be treated as read-only
+# internally; recommend() copies anything template-owned before returning it.
+_PACK_FILES = ("champions.json", "items.json", "traits.json")
+MtimeStamp = Tuple[Tuple[str, int], ...]
+
+
+def _mtime_stamp(paths: Iterable[Path]) -> MtimeStamp:
+    return tuple((str(p), p.stat().st_mtime_ns) for p in paths)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_pack_cached(pack_dir: str, stamp: MtimeStamp) -> Dict[str, Any]:
+    return load_pack(Path(pack_dir))
+
+
+@functools.lru_cache(maxsize=8)
+def _load_templates_cached(path: str, stamp: MtimeStamp) -> List[Dict[str, Any]]:
+    return load_templates(Path(path))
+
+
+def cached_pack(pack_dir: Path) -> Dict[str, Any]:
+    return _load_pack_cached(str(pack_dir), _mtime_stamp(pack_dir / f for f in _PACK_FILES))
+
+
+def cached_templates(path: Path) -> List[Dict[str, Any]]:
+    if path.is_dir():
+        stamp = _mtime_stamp(_template_paths(path))
+    elif path.is_file():
+        stamp = _mtime_stamp([path])
+    else:
+        raise FileNotFoundError(str(path))
+    return _load_templates_cached(str(path), stamp)
+
+
 # ---------- Helpers ----------
+# every canonical stage string ("1-1".."7-9"), so the common case is one dict lookup
+_STAGE_INT: Dict[str, int] = {f"{a}-{b}": a * 10 + b for a in range(1, 8) for b in range(1, 10)}
+
+
 def stage_to_int(stage: str) -> int:
+    if not isinstance(stage, str):
+        return 0
+    i = _STAGE_INT.get(stage)
+    return i if i is not None else _parse_stage(stage)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_stage(stage: str) -> int:
+    # non-canonical input (" 4-1", "+4-1", "10-1", junk) only; cached, so the except is cold
     try:
         a, b = stage.split("-")
         return int(a) * 10 + int(b)
-    except Exception:
+    except ValueError:
         return 0
 
 
-def count_traits(pack: Dict[str, Any], unit_ids: List[str]) -> Counter:
-    ctr = Counter()
+def count_traits(pack: Dict[str, Any], unit_ids: List[str]) -> List[int]:
+    # histogram indexed by pack["trait_index"][trait_id]
+    hist = [0] * len(pack["trait_index"])
+    champions = pack["champions"]
     for uid in unit_ids:
-        champ = pack["champions"].get(uid)
+        champ = champions.get(uid)
         if not champ:
             continue
-        for tid in champ.get("traits", []):
-            ctr[tid] += 1
-    return ctr
-
-
-def craftable_items(pack: Dict[str, Any], inventory: List[str]) -> List[str]:
-    inv = Counter(inventory)
-    out = []
-    for it in pack["items"].values():
-        if it.get("kind") != "completed":
-            continue
-        comps = it.get("components", [])
-        if len(comps) != 2:
-            continue
-        need = Counter(comps)
-        if all(inv[c] >= need[c] for c in need):
-            out.append(it["id"])
-    return sorted(out)
+        for j in champ.trait_idx:
+            hist[j] += 1
+    return hist
+
+
+_CRAFTABLE_CACHE_SIZE = 64
+
+
+def craftable_items(pack: Dict[str, Any], inventory: List[str]) -> FrozenSet[str]:
+    # inventories are tiny (<= 10 components) and repeat across recommends on the same pack;
+    # result is unordered, callers only test membership / intersect
+    key = tuple(sorted(inventory))
+    cache = pack["_craftable_cache"]
+    out = cache.get(key)
+    if out is not None:
+        return out
+
+    component_index = pack["_component_index"]
+    inv = [0] * len(component_index)
+    for c in inventory:
+        j = component_index.get(c)
+        if j is not None:  # completed items/artifacts in the inventory never feed a recipe
+            inv[j] += 1
+    out = frozenset(
+        item_id
+        for item_id, a, b, need_b in pack["_completed_recipes"]
+        if inv[a] and inv[b] >= need_b
+    )
+    if len(cache) >= _CRAFTABLE_CACHE_SIZE:
+        cache.clear()
+    cache[key] = out
+    return out
 
 
 def desired_items_index(template: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    # templates are read-only once loaded, so the index is built once and kept on the dict
+    cached = template.get("_desired_idx")
+    if cached is not None:
+        return cached
     out: Dict[str, Dict[str, Any]] = {}
-    items_block = template.get("items", {})
-    for holder_id, plan in items_block.items():
-        if not isinstance(plan, dict):
-            continue
-        ids = plan.get("items") or []
-        if not isinstance(ids, list):
-            continue
-        for idx, item_id in enumerate(ids):
-            if not isinstance(item_id, str):
-                continue
+    # shape is guaranteed by the template schema (see load_templates)
+    for holder_id, plan in template.get("items", {}).items():
+        for idx, item_id in enumerate(plan.get("items", ())):
             out[item_id] = {
                 "final_holder": holder_id,
                 "priority_index": idx,
                 "is_core": idx < 2
             }
+    template["_desired_idx"] = out
     return out
 
 
-def normalize_then(then_val: Any) -> Dict[str, Any]:
-    if isinstance(then_val, dict):
-        return then_val
-    if isinstance(then_val, str):
-        if ":" in then_val:
-            tag, msg = then_val.split(":", 1)
-            tag = tag.strip()
-            msg = msg.strip()
-            if tag == "pivot_to_backup_void":
-                return {"action": "switch_template", "target": "backup_void", "why": msg or "Pivot to backup."}
-            if tag in {"hard_pivot", "soft_pivot_warning"}:
-                return {"action": "consider_templates", "targets": ["backup_void", "greedy_fast8"], "why": msg or "Consider pivot."}
-            if tag == "convert_lead":
-                return {"action": "set_policy", "policy": "push_levels", "why": msg or "Convert lead by leveling."}
-            if tag == "stop_greed":
-                return {"action": "set_policy", "policy": "stabilize_now", "why": msg or "Stabilize now."}
-            return {"action": "note", "tag": tag, "message": msg}
-        return {"action": "note", "message": then_val}
+def template_trait_targets(template: Dict[str, Any]) -> Tuple[Tuple[str, Optional[int]], ...]:
+    # core_traits as (trait_id, target) pairs, cached as _trait_targets
+    cached = template.get("_trait_targets")
+    if cached is None:
+        cached = template["_trait_targets"] = tuple((t["trait"], t.get("target")) for t in template.get("core_traits", []))
+    return cached
+
+
+def template_unit_sets(template: Dict[str, Any]) -> Tuple[frozenset, frozenset]:
+    # (required, core) unit ids as sets, cached as _req_set / _core_set
+    req_set = template.get("_req_set")
+    if req_set is None:
+        units = template.get("units", {})
+        req_set = template["_req_set"] = frozenset(units.get("required", []))
+        template["_core_set"] = frozenset(units.get("core", []))
+    return req_set, template["_core_set"]
+
+
+def template_ctx(template: Dict[str, Any]) -> TemplateCtx:
+    # holder-selection fields, cached as _ctx
+    cached = template.get("_ctx")
+    if cached is None:
+        cached = template["_ctx"] = TemplateCtx.from_template(template)
+    return cached
+
+
+def _then_from_str(then_val: str) -> Dict[str, Any]:
+    if ":" in then_val:
+        tag, msg = then_val.split(":", 1)
+        tag = tag.strip()
+        msg = msg.strip()
+        if tag == "pivot_to_backup_void":
+            return {"action": "switch_template", "target": "backup_void", "why": msg or "Pivot to backup."}
+        if tag in {"hard_pivot", "soft_pivot_warning"}:
+            return {"action": "consider_templates", "targets": ["backup_void", "greedy_fast8"], "why": msg or "Consider pivot."}
+        if tag == "convert_lead":
+            return {"action": "set_policy", "policy": "push_levels", "why": msg or "Convert lead by leveling."}
+        if tag == "stop_greed":
+            return {"action": "set_policy", "policy": "stabilize_now", "why": msg or "Stabilize now."}
+        return {"action": "note", "tag": tag, "message": msg}
+    return {"action": "note", "message": then_val}
+
+
+def _then_from_other(then_val: Any) -> Dict[str, Any]:
     return {"action": "note", "message": str(then_val)}
 
 
+# "then" is an object or a shorthand string (schema-checked); anything else is a bare note
+_THEN_BY_TYPE: Dict[type, Callable[[Any], Dict[str, Any]]] = {
+    dict: lambda v: v,
+    str: _then_from_str,
+}
+
+
+def normalize_then(then_val: Any) -> Dict[str, Any]:
+    return _THEN_BY_TYPE.get(type(then_val), _then_from_other)(then_val)
+
+
+def prepare_gs(pack: Dict[str, Any], gs: Dict[str, Any]) -> Dict[str, Any]:
+    # shallow copy of gs plus the derived lookups (_board_set, _stars, _trait_counts, ...) every pass reads
+    board = gs.get("board", [])
+    bench = gs.get("bench", [])
+    obs = (gs.get("observations", {}) or {})
+
+    stars: Dict[str, int] = {}
+    for u in board + bench:
+        cid = u.get("champion_id")
+        stars[cid] = max(stars.get(cid, 0), int(u.get("stars", 1)))
+
+    out = dict(gs)
+    out["_board_ids"] = [u["champion_id"] for u in board]
+    out["_bench_ids"] = [u["champion_id"] for u in bench]
+    out["_board_set"] = frozenset(out["_board_ids"])
+    out["_bench_set"] = frozenset(out["_bench_ids"])
+    out["_owned_set"] = out["_board_set"] | out["_bench_set"]
+    out["_stars"] = stars
+    out["_stage_i"] = stage_to_int(gs.get("stage", ""))
+    out["_stability"] = obs.get("stability", "unknown")
+    out["_contested"] = frozenset(obs.get("contested_units", []) or [])
+    # board trait counts are the same for every template, so count them once here
+    out["_trait_counts"] = count_traits(pack, out["_board_ids"])
+    return out
+
+
 def unit_stars(gs: Dict[str, Any], champion_id: str) -> int:
-    best = 0
-    for u in gs.get("board", []):
-        if u.get("champion_id") == champion_id:
-            best = max(best, int(u.get("stars", 1)))
-    for u in gs.get("bench", []):
-        if u.get("champion_id") == champion_id:
-            best = max(best, int(u.get("stars", 1)))
-    return best
+    return gs["_stars"].get(champion_id, 0)
+
 
+# "<champion_id>_<stars>"; greedy prefix so the split is on the last underscore
+_MISS_RE = re.compile(r"(.*)_(\d+)", re.DOTALL)
 
+
+@functools.lru_cache(maxsize=256)
 def parse_miss_token(token: str) -> Tuple[str, Optional[int]]:
-    if "_" in token:
-        champ, maybe_num = token.rsplit("_", 1)
+    m = _MISS_RE.fullmatch(token)
+    if m:
+        return m.group(1), int(m.group(2))
+    # anything else int() still accepts ("x_+2", "x_ 2"); cached, so the except is cold
+    champ, sep, maybe_num = token.rpartition("_")
+    if sep:
         try:
             return champ, int(maybe_num)
         except ValueError:
-            return token, None
+            pass
     return token, None
 
 
 # ---------- Core decision logic (yours) ----------
-def choose_now_holder(pack: Dict[str, Any], gs: Dict[str, Any], template: Dict[str, Any], item_id: str, final_holder: str) -> str:
-    board_ids = [u["champion_id"] for u in gs["board"]]
-    if final_holder in board_ids:
-        return final_holder
+_UTILITY_TAGS = frozenset({"antiheal", "shred", "cc", "cleanse"})
+_NO_TAGS: frozenset = frozenset()
 
-    item = pack["items"].get(item_id, {})
-    tags = set(item.get("effect_tags", []) or [])
 
-    carry_plan = template.get("carry_plan", {})
-    primary = carry_plan.get("primary_carry")
-    tank = carry_plan.get("main_tank")
-    secondary = carry_plan.get("secondary_carries", []) or []
-    utility = carry_plan.get("utility_carry")
+def choose_now_holder(pack: Dict[str, Any], gs: Dict[str, Any], tctx: TemplateCtx, item_id: str, final_holder: str) -> str:
+    board_ids = gs["_board_ids"]
+    board_set = gs["_board_set"]
+    if final_holder in board_set:
+        return final_holder
 
-    holder_rules = template.get("holder_rules", {}) or {}
-    carry_placeholders = holder_rules.get("carry_placeholders", []) or []
-    tank_placeholders = holder_rules.get("tank_placeholders", []) or []
-    utility_placeholders = holder_rules.get("utility_placeholders", []) or []
+    item = pack["items"].get(item_id)
+    tags = item.effect_tags if item else _NO_TAGS
 
-    def first_on_board(candidates: List[str]) -> Optional[str]:
-        for c in candidates:
-            if c in board_ids:
-                return c
-        return None
+    def first_on_board(candidates: Tuple[str, ...]) -> Optional[str]:
+        return next((c for c in candidates if c in board_set), None)
 
     if "tank" in tags:
-        if tank in board_ids:
-            return tank
-        ph = first_on_board(tank_placeholders)
+        if tctx.tank in board_set:
+            return tctx.tank
+        ph = first_on_board(tctx.tank_ph)
         if ph:
             return ph
-        for uid in template.get("units", {}).get("required", []):
-            if uid in board_ids:
-                return uid
+        # first required unit (template order) that is fielded
+        uid = first_on_board(tctx.required)
+        if uid:
+            return uid
         return board_ids[0] if board_ids else final_holder
 
-    if any(t in tags for t in ["antiheal", "shred", "cc", "cleanse"]):
-        if utility in board_ids:
-            return utility
-        ph = first_on_board(utility_placeholders)
+    if tags & _UTILITY_TAGS:
+        if tctx.utility in board_set:
+            return tctx.utility
+        ph = first_on_board(tctx.util_ph)
         if ph:
             return ph
-        for uid in secondary:
-            if uid in board_ids:
-                return uid
-        if primary in board_ids:
-            return primary
+        uid = first_on_board(tctx.secondary)
+        if uid:
+            return uid
+        if tctx.primary in board_set:
+            return tctx.primary
         return board_ids[0] if board_ids else final_holder
 
-    if primary in board_ids:
-        return primary
-    for uid in secondary:
-        if uid in board_ids:
-            return uid
-    ph = first_on_board(carry_placeholders)
+    if tctx.primary in board_set:
+        return tctx.primary
+    uid = first_on_board(tctx.secondary)
+    if uid:
+        return uid
+    ph = first_on_board(tctx.carry_ph)
     if ph:
         return ph
 
     return board_ids[0] if board_ids else final_holder
 
 
-def item_actions(pack: Dict[str, Any], template: Dict[str, Any], gs: Dict[str, Any], craftable_now: List[str]) -> List[Dict[str, Any]]:
+def item_actions(pack: Dict[str, Any], template: Dict[str, Any], gs: Dict[str, Any], craftable_now: Iterable[str]) -> List[Dict[str, Any]]:
     desired = desired_items_index(template)
-    board_ids = [u["champion_id"] for u in gs["board"]]
+    tctx = template_ctx(template)
+    board_set = gs["_board_set"]
 
-    stability = (gs.get("observations", {}) or {}).get("stability", "unknown")
-    stage_i = stage_to_int(gs.get("stage", ""))
+    stability = gs["_stability"]
+    stage_i = gs["_stage_i"]
 
     actions: List[Dict[str, Any]] = []
-    for item_id in craftable_now:
-        if item_id not in desired:
-            continue
-
+    # only craftable items the template actually wants; output order comes from the sort below
+    for item_id in desired.keys() & craftable_now:
         meta = desired[item_id]
         final_holder = meta["final_holder"]
         is_core = bool(meta["is_core"])
         idx = int(meta["priority_index"])
 
-        now_holder = choose_now_holder(pack, gs, template, item_id, final_holder)
+        now_holder = choose_now_holder(pack, gs, tctx, item_id, final_holder)
 
         if is_core:
             action = "slam_now"
@@ -220,7 +403,7 @@ def item_actions(pack: Dict[str, Any], template: Dict[str, Any], gs: Dict[str, A
                 why = "You benefit from immediate power; slam to stabilise."
 
         transfer = None
-        if final_holder not in board_ids:
+        if final_holder not in board_set:
             transfer = {"final_holder": final_holder, "when": "transfer_when_final_holder_is_fielded"}
 
         actions.append({
@@ -238,29 +421,29 @@ def item_actions(pack: Dict[str, Any], template: Dict[str, Any], gs: Dict[str, A
     return actions
 
 
+_MAX_SHOP_ACTIONS = 12
+
+
 def shop_actions(template: Dict[str, Any], gs: Dict[str, Any]) -> List[Dict[str, Any]]:
-    board_ids = [u["champion_id"] for u in gs["board"]]
-    bench_ids = [u["champion_id"] for u in gs.get("bench", [])]
-    owned = set(board_ids + bench_ids)
+    owned = gs["_owned_set"]
 
     required = template.get("units", {}).get("required", [])
     core = template.get("units", {}).get("core", [])
+    req_set, core_set = template_unit_sets(template)
 
-    actions: List[Dict[str, Any]] = []
-    for uid in required:
-        if uid not in owned:
-            actions.append({"action": "priority_buy", "champion_id": uid, "why": "Required for the line."})
-    for uid in core:
-        if uid not in owned and uid not in required:
-            actions.append({"action": "buy_if_seen", "champion_id": uid, "why": "Core board piece."})
-
-    return actions[:12]
+    # membership work done as set ops; iterate the original lists to keep template order
+    missing_req = req_set - owned
+    missing_core = core_set - owned - req_set
+    actions = itertools.chain(
+        ({"action": "priority_buy", "champion_id": uid, "why": "Required for the line."} for uid in required if uid in missing_req),
+        ({"action": "buy_if_seen", "champion_id": uid, "why": "Core board piece."} for uid in core if uid in missing_core),
+    )
+    return list(itertools.islice(actions, _MAX_SHOP_ACTIONS))
 
 
 def pivot_warnings(template: Dict[str, Any], gs: Dict[str, Any]) -> List[str]:
-    stage_i = stage_to_int(gs.get("stage", ""))
-    obs = (gs.get("observations", {}) or {})
-    contested = set(obs.get("contested_units", []) or [])
+    stage_i = gs["_stage_i"]
+    contested = gs["_contested"]
 
     primary = (template.get("carry_plan", {}) or {}).get("primary_carry")
     warnings: List[str] = []
@@ -270,36 +453,46 @@ def pivot_warnings(template: Dict[str, Any], gs: Dict[str, Any]) -> List[str]:
     return warnings
 
 
-def score_template(pack: Dict[str, Any], template: Dict[str, Any], gs: Dict[str, Any]) -> Tuple[float, Dict[str, Any]]:
-    board_ids = [u["champion_id"] for u in gs["board"]]
-    bench_ids = [u["champion_id"] for u in gs.get("bench", [])]
-    owned = set(board_ids + bench_ids)
+# score weights; score_upper_bound() reads the same ones, so the bound never undercounts
+W_REQ_UNIT = 10
+W_CORE_UNIT = 2
+W_TRAIT_UNIT = 2  # per unit towards a targeted trait
+W_TRAIT_DONE = 5  # targeted trait reached
+W_TRAIT_OPEN = 1  # per unit of an untargeted core trait
+W_CRAFT = 3
+
+
+def unit_hits(template: Dict[str, Any], gs: Dict[str, Any]) -> Tuple[int, int]:
+    # (required, core) units owned
+    owned = gs["_owned_set"]
+    req_set, core_set = template_unit_sets(template)
+    return len(req_set & owned), len(core_set & owned)
 
+
+def score_template(pack: Dict[str, Any], template: Dict[str, Any], gs: Dict[str, Any], craft_now: FrozenSet[str], hits: Optional[Tuple[int, int]] = None) -> Tuple[float, Dict[str, Any]]:
     required = template["units"]["required"]
     core = template["units"]["core"]
 
-    req_hit = sum(1 for u in required if u in owned)
-    core_hit = sum(1 for u in core if u in owned)
-    unit_score = req_hit * 10 + core_hit * 2
+    req_hit, core_hit = hits if hits is not None else unit_hits(template, gs)
+    unit_score = req_hit * W_REQ_UNIT + core_hit * W_CORE_UNIT
 
-    trait_counts = count_traits(pack, board_ids)
+    trait_counts = gs["_trait_counts"]
+    trait_index = pack["trait_index"]
     trait_score = 0
     trait_detail = []
-    for t in template.get("core_traits", []):
-        tid = t["trait"]
-        target = t.get("target")
-        have = int(trait_counts.get(tid, 0))
+    for tid, target in template_trait_targets(template):
+        j = trait_index.get(tid)
+        have = trait_counts[j] if j is not None else 0
         if target:
-            trait_score += min(have, target) * 2
+            trait_score += min(have, target) * W_TRAIT_UNIT
             if have >= target:
-                trait_score += 5
+                trait_score += W_TRAIT_DONE
         else:
-            trait_score += have
+            trait_score += have * W_TRAIT_OPEN
         trait_detail.append({"trait": tid, "have": have, "target": target})
 
-    craft_now = craftable_items(pack, gs.get("inventory", []))
     desired = desired_items_index(template)
-    craft_score = sum(1 for x in craft_now if x in desired) * 3
+    craft_score = len(craft_now & desired.keys()) * W_CRAFT
 
     total = unit_score + trait_score + craft_score
 
@@ -312,78 +505,136 @@ def score_template(pack: Dict[str, Any], template: Dict[str, Any], gs: Dict[str,
         "req_total": len(required),
         "core_hit": core_hit,
         "core_total": len(core),
-        "craftable_now": craft_now
+        # "craftable_now" (display order) is filled in by recommend() for the cards it returns
     }
     return float(total), breakdown
 
 
-def eval_pivot_triggers(template: Dict[str, Any], gs: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-    raw = template.get("pivot_triggers", []) or []
-    triggers: List[Dict[str, Any]] = []
-    for trig in raw:
-        if isinstance(trig, dict):
-            normalized = dict(trig)
-            normalized["then"] = normalize_then(trig.get("then"))
-            triggers.append(normalized)
-
-    stage_i = stage_to_int(gs.get("stage", ""))
-    obs = (gs.get("observations", {}) or {})
-    stability = obs.get("stability", "unknown")
-    contested = set(obs.get("contested_units", []) or [])
+def template_bonus_caps(template: Dict[str, Any]) -> Tuple[int, int, int]:
+    # (max targeted-trait score, untargeted trait count, desired item count), cached as _bonus_caps
+    cached = template.get("_bonus_caps")
+    if cached is None:
+        targets = template_trait_targets(template)
+        cached = template["_bonus_caps"] = (
+            sum(target * W_TRAIT_UNIT + W_TRAIT_DONE for _, target in targets if target),
+            sum(1 for _, target in targets if not target),
+            len(desired_items_index(template)),
+        )
+    return cached
+
+
+def score_upper_bound(template: Dict[str, Any], hits: Tuple[int, int], craft_now: FrozenSet[str], max_trait_count: int) -> int:
+    # exact unit score plus the bonus ceilings; never below score_template()
+    req_hit, core_hit = hits
+    trait_cap, n_untargeted, n_desired = template_bonus_caps(template)
+    return (
+        req_hit * W_REQ_UNIT + core_hit * W_CORE_UNIT
+        + trait_cap + n_untargeted * max_trait_count * W_TRAIT_OPEN
+        + min(n_desired, len(craft_now)) * W_CRAFT
+    )
+
+
+TriggerPredicate = Callable[[int, str, FrozenSet[str], Dict[str, int]], bool]
+
+
+def compile_trigger(trig: Dict[str, Any], primary: Optional[str]) -> Tuple[TriggerPredicate, ...]:
+    # one pred(stage_i, stability, contested, stars) per gate the trigger sets; () means always active
+    preds: List[TriggerPredicate] = []
+
+    by_stage = trig.get("by_stage")
+    if by_stage is not None:
+        min_stage_i = stage_to_int(by_stage)
+        preds.append(lambda stage_i, stability, contested, stars: stage_i >= min_stage_i)
+
+    if trig.get("if_stable") is True:
+        preds.append(lambda stage_i, stability, contested, stars: stability == "stable")
+    if trig.get("if_unstable") is True:
+        preds.append(lambda stage_i, stability, contested, stars: stability != "stable")
+
+    who = trig.get("contested_unit") or primary
+    if trig.get("if_contested") is True:
+        preds.append(lambda stage_i, stability, contested, stars: bool(who) and who in contested)
+    if trig.get("if_uncontested") is True:
+        preds.append(lambda stage_i, stability, contested, stars: not who or who not in contested)
+
+    if_miss = trig.get("if_miss")
+    if if_miss is not None:
+        miss_champ, miss_stars = parse_miss_token(if_miss)
+        if miss_stars is None:
+            preds.append(lambda stage_i, stability, contested, stars: stars.get(miss_champ, 0) <= 0)
+        else:
+            preds.append(lambda stage_i, stability, contested, stars: stars.get(miss_champ, 0) < miss_stars)
 
-    active: List[Dict[str, Any]] = []
-    for trig in triggers:
-        by_stage = trig.get("by_stage")
-        if isinstance(by_stage, str) and stage_to_int(by_stage) > stage_i:
-            continue
+    return tuple(preds)
 
-        if trig.get("if_stable") is True and stability != "stable":
-            continue
-        if trig.get("if_unstable") is True and stability == "stable":
-            continue
 
-        if trig.get("if_contested") is True:
-            who = trig.get("contested_unit") or (template.get("carry_plan", {}) or {}).get("primary_carry")
-            if not who or who not in contested:
-                continue
-        if trig.get("if_uncontested") is True:
-            who = trig.get("contested_unit") or (template.get("carry_plan", {}) or {}).get("primary_carry")
-            if who and who in contested:
-                continue
-
-        if_miss = trig.get("if_miss")
-        if isinstance(if_miss, str):
-            champ, stars = parse_miss_token(if_miss)
-            have_stars = unit_stars(gs, champ)
-            if stars is None:
-                if have_stars > 0:
-                    continue
-            else:
-                if have_stars >= stars:
-                    continue
+def compile_triggers(template: Dict[str, Any]) -> List[Tuple[Tuple[TriggerPredicate, ...], Dict[str, Any]]]:
+    # [(predicates, normalized_trigger), ...], cached as _compiled_triggers
+    cached = template.get("_compiled_triggers")
+    if cached is not None:
+        return cached
+
+    primary = (template.get("carry_plan", {}) or {}).get("primary_carry")
+    compiled: List[Tuple[Tuple[TriggerPredicate, ...], Dict[str, Any]]] = []
+    for trig in template.get("pivot_triggers", []) or []:
+        normalized = dict(trig)
+        normalized["then"] = normalize_then(trig.get("then"))
+        compiled.append((compile_trigger(trig, primary), normalized))
+
+    template["_compiled_triggers"] = compiled
+    return compiled
 
-        active.append(dict(trig))
 
+def eval_pivot_triggers(template: Dict[str, Any], gs: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    compiled = compile_triggers(template)
+    stage_i, stability, contested, stars = gs["_stage_i"], gs["_stability"], gs["_contested"], gs["_stars"]
+
+    # fresh copies per call: the normalized triggers live in the template's compiled cache
+    triggers = [{**nt, "then": dict(nt["then"])} for _, nt in compiled]
+    active = [
+        {**nt, "then": dict(nt["then"])}
+        for preds, nt in compiled
+        if all(p(stage_i, stability, contested, stars) for p in preds)
+    ]
     return triggers, active
 
 
 # ---------- Public entrypoint for UI + CLI ----------
 def recommend(pack_dir: Path, templates_path: Path, gs: Dict[str, Any], top_n: int = 3) -> Dict[str, Any]:
-    pack = load_pack(pack_dir)
-    templates = load_templates(templates_path)
+    pack = cached_pack(pack_dir)
+    templates = cached_templates(templates_path)
+    gs = prepare_gs(pack, gs)
+    # depends only on pack + inventory, so it is shared by every template
+    craft_now = craftable_items(pack, gs.get("inventory", []))
+
+    max_trait_count = max(gs["_trait_counts"], default=0)
 
     scored: List[Tuple[float, Dict[str, Any], Dict[str, Any]]] = []
+    cutoff: List[float] = []  # min-heap of the best top_n scores so far
     for t in templates:
-        s, breakdown = score_template(pack, t, gs)
+        # A later template only displaces an earlier one on a strictly higher score, so
+        # anything whose bound can't beat the current N-th best is skipped unscored.
+        hits = unit_hits(t, gs)
+        if top_n > 0 and len(cutoff) >= top_n and score_upper_bound(t, hits, craft_now, max_trait_count) <= cutoff[0]:
+            continue
+        s, breakdown = score_template(pack, t, gs, craft_now, hits)
         scored.append((s, t, breakdown))
-    scored.sort(key=lambda x: x[0], reverse=True)
+        if len(cutoff) < top_n:
+            heapq.heappush(cutoff, s)
+        elif top_n > 0:
+            heapq.heappushpop(cutoff, s)
+    # same order (ties included) as sorted(..., reverse=True)[:top_n], without sorting every template
+    top = heapq.nlargest(top_n, scored, key=itemgetter(0))
 
     tiers = ["primary", "backup", "greedy"]
     cards = []
 
-    for idx, (s, t, breakdown) in enumerate(scored[:top_n]):
+    # craft_now is an unordered set everywhere else; sort once, only for display
+    craft_sorted = sorted(craft_now)
+
+    for idx, (s, t, breakdown) in enumerate(top):
         tier = tiers[idx] if idx < len(tiers) else "option"
-        craft_now = breakdown["craftable_now"]
+        breakdown["craftable_now"] = list(craft_sorted)
 
         all_trigs, active_trigs = eval_pivot_triggers(t, gs)
 
@@ -395,7 +646,7 @@ def recommend(pack_dir: Path, templates_path: Path, gs: Dict[str, Any], top_n: i
             "score": s,
             "shop_actions": shop_actions(t, gs),
             "item_actions": item_actions(pack, t, gs, craft_now),
-            "level_plan_hint": next((p for p in t.get("level_plan", []) if p.get("stage") == gs.get("stage")), None),
+            "level_plan_hint": next((dict(p) for p in t.get("level_plan", []) if p.get("stage") == gs.get("stage")), None),
             "pivot_warnings": pivot_warnings(t, gs),
             "pivot_triggers": all_trigs,
             "active_pivot_triggers": active_trigs,
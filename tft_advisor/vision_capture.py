@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Optional, Tuple
 import base64
 import io
+import threading
 
 import mss
-import numpy as np
 from PIL import Image
 
 
@@ -15,38 +16,103 @@ class CaptureResult:
     monitor_index: int
     size: Tuple[int, int]
     png_bytes: bytes
-    data_url: str  # data:image/png;base64,...
 
+    @cached_property
+    def data_url(self) -> str:
+        """data:image/png;base64,... — only built (once) when a consumer asks for it."""
+        b64 = base64.b64encode(self.png_bytes).decode("utf-8")
+        return f"data:image/png;base64,{b64}"
 
-def capture_monitor_png(monitor_index: int = 1) -> CaptureResult:
+    @cached_property
+    def preview_jpeg(self) -> bytes:
+        """Small JPEG for on-screen preview (<= PREVIEW_WIDTH wide); the PNG stays the source
+        of truth for the vision read. Built once per capture, so UI reruns reuse it."""
+        img = Image.open(io.BytesIO(self.png_bytes))
+        if img.width > PREVIEW_WIDTH:
+            img = img.resize((PREVIEW_WIDTH, round(img.height * PREVIEW_WIDTH / img.width)), Image.Resampling.BILINEAR)
+        buf = io.BytesIO()
+        img.convert("RGB").save(buf, format="JPEG", quality=80)
+        return buf.getvalue()
+
+
+# Preview only needs to fill a UI column, not carry the full capture.
+PREVIEW_WIDTH = 1200
+
+
+# MSS handles (DCs/DXGI on Windows, X display on Linux) are per-thread, so keep one
+# per thread and reuse it instead of re-creating it for every capture.
+_tls = threading.local()
+
+
+def _get_sct() -> mss.base.MSSBase:
+    sct = getattr(_tls, "sct", None)
+    if sct is None:
+        sct = _tls.sct = mss.mss()
+    return sct
+
+
+def close() -> None:
+    """Releases this thread's MSS handle. The next capture reopens it (and re-reads the
+    monitor layout), so call this after a display change too."""
+    sct = getattr(_tls, "sct", None)
+    if sct is not None:
+        _tls.sct = None
+        sct.close()
+
+
+# Long-edge cap for what we send to the vision model. Latency and token cost scale with
+# pixels/tiles, and the HUD stays legible well below native 1440p/4K.
+DEFAULT_MAX_SIDE = 1536
+
+# zlib level for the capture PNG. Captures are transient (preview + one upload), so the
+# fast level wins: several times quicker than Pillow's default for a modestly larger file.
+PNG_COMPRESS_LEVEL = 1
+
+
+def capture_monitor_png(
+    monitor_index: int = 1,
+    *,
+    region: Optional[Tuple[int, int, int, int]] = None,
+    max_side: Optional[int] = DEFAULT_MAX_SIDE,
+) -> CaptureResult:
     """
-    Captures an entire monitor using MSS and returns PNG bytes + a data URL.
+    Captures a monitor using MSS and returns PNG bytes (+ a lazy data URL).
 
     monitor_index: 1..N where sct.monitors[0] is the "all monitors" virtual screen.
+    region: optional (left, top, width, height) relative to that monitor, e.g. the TFT
+        play area on an ultrawide; only those pixels are grabbed.
+    max_side: downscale so the long edge is at most this many pixels (None = native).
     """
-    with mss.mss() as sct:
-        if monitor_index < 1 or monitor_index >= len(sct.monitors):
+    sct = _get_sct()
+    if monitor_index < 1 or monitor_index >= len(sct.monitors):
+        raise ValueError(
+            f"Invalid monitor_index={monitor_index}. Available: 1..{len(sct.monitors)-1}"
+        )
+
+    mon = sct.monitors[monitor_index]
+    if region is not None:
+        left, top, width, height = region
+        if (
+            left < 0 or top < 0 or width <= 0 or height <= 0
+            or left + width > mon["width"] or top + height > mon["height"]
+        ):
             raise ValueError(
-                f"Invalid monitor_index={monitor_index}. Available: 1..{len(sct.monitors)-1}"
+                f"Invalid region={region} for monitor {monitor_index} ({mon['width']}x{mon['height']})"
             )
+        mon = {"left": mon["left"] + left, "top": mon["top"] + top, "width": width, "height": height}
+    grab = sct.grab(mon)
 
-        mon = sct.monitors[monitor_index]
-        grab = sct.grab(mon)
-
-        # MSS returns BGRA; convert to RGB via numpy
-        arr = np.array(grab)  # shape (h, w, 4)
-        rgb = arr[:, :, :3][:, :, ::-1]  # BGRA -> RGB
-
-        img = Image.fromarray(rgb, mode="RGB")
-        buf = io.BytesIO()
-        img.save(buf, format="PNG")
-        png_bytes = buf.getvalue()
+    # MSS returns BGRA; let PIL's raw decoder read it as BGRX -> RGB in one C pass
+    # (no numpy array, no channel-swapped view to copy again).
+    img = Image.frombuffer("RGB", grab.size, grab.bgra, "raw", "BGRX", 0, 1)
+    if max_side:
+        img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
+    png_bytes = buf.getvalue()
 
-    b64 = base64.b64encode(png_bytes).decode("utf-8")
-    data_url = f"data:image/png;base64,{b64}"
     return CaptureResult(
         monitor_index=monitor_index,
         size=img.size,
         png_bytes=png_bytes,
-        data_url=data_url,
     )
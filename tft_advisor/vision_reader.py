@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Literal, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Literal, Optional, Tuple
 from pydantic import BaseModel, Field, ValidationError
 
 from openai import OpenAI
@@ -40,22 +41,20 @@ class GameStateFromVision(BaseModel):
     observations: Observations = Field(default_factory=Observations)
 
 
+class GameStateBatch(BaseModel):
+    # One entry per screenshot, in the order the images were sent
+    items: List[GameStateFromVision] = Field(default_factory=list)
+
+
 # --------- Vision read ---------
 
-def build_vision_prompt(
-    set_patch: str,
-    champion_ids: List[str],
-    item_ids: List[str],
-) -> str:
-    """
-    IMPORTANT: keep this prompt compact-ish. We give the model the allowed IDs so it can
-    output normalized identifiers directly.
-    """
-    # Limiting the lists can help latency/cost if needed later.
-    champs_preview = ", ".join(champion_ids)
-    items_preview = ", ".join(item_ids)
+@lru_cache(maxsize=4)
+def _client(api_key: str) -> OpenAI:
+    # One client per key so repeated reads reuse its HTTP connection pool (no new TLS handshake).
+    return OpenAI(api_key=api_key)
+
 
-    return f"""
+_PROMPT_RULES = """
 You are reading a Teamfight Tactics (TFT) screenshot.
 
 Goal:
@@ -72,15 +71,25 @@ Rules:
 - augments: include augment IDs/names if clearly visible; otherwise return [].
 - observations.stability: choose "stable" / "unstable" / "unknown". If unclear, "unknown".
 - observations.contested_units: leave [] for now unless it is explicitly provided (usually it won't be visible).
+""".strip()
 
-Set patch to use: {set_patch}
-
-Allowed champion_ids:
-{champs_preview}
 
-Allowed item_ids:
-{items_preview}
-""".strip()
+@lru_cache(maxsize=8)
+def _prompt_blocks(
+    set_patch: str,
+    champion_ids: Tuple[str, ...],
+    item_ids: Tuple[str, ...],
+) -> Tuple[str, ...]:
+    """
+    IMPORTANT: keep this prompt compact-ish. We give the model the allowed IDs so it can
+    output normalized identifiers directly. Rendered once per (set_patch, id lists); an
+    empty list still sends its header, i.e. "no ids of this kind are allowed".
+    """
+    return (
+        f"{_PROMPT_RULES}\n\nSet patch to use: {set_patch}",
+        "Allowed champion_ids:\n" + ", ".join(champion_ids),
+        "Allowed item_ids:\n" + ", ".join(item_ids),
+    )
 
 
 def read_gamestate_from_screenshot(
@@ -95,9 +104,9 @@ def read_gamestate_from_screenshot(
     """
     Calls OpenAI vision + structured parsing and returns a plain dict suitable for recommend().
     """
-    client = OpenAI(api_key=api_key)
+    client = _client(api_key)
 
-    prompt = build_vision_prompt(set_patch=set_patch, champion_ids=champion_ids, item_ids=item_ids)
+    blocks = _prompt_blocks(set_patch, tuple(champion_ids), tuple(item_ids))
 
     # Images as input via Responses API (data URL) :contentReference[oaicite:3]{index=3}
     # Structured parse via responses.parse + Pydantic :contentReference[oaicite:4]{index=4}
@@ -108,7 +117,7 @@ def read_gamestate_from_screenshot(
             {
                 "role": "user",
                 "content": [
-                    {"type": "input_text", "text": prompt},
+                    *({"type": "input_text", "text": b} for b in blocks),
                     {"type": "input_image", "image_url": screenshot_data_url},
                 ],
             },
@@ -118,3 +127,53 @@ def read_gamestate_from_screenshot(
 
     gs: GameStateFromVision = resp.output_parsed  # type: ignore
     return gs.model_dump()
+
+
+def read_gamestates_from_screenshots(
+    *,
+    api_key: str,
+    model: str,
+    set_patch: str,
+    screenshot_data_urls: List[str],
+    champion_ids: List[str],
+    item_ids: List[str],
+) -> List[Dict[str, Any]]:
+    """
+    Batched variant of read_gamestate_from_screenshot(): all screenshots go in one
+    Responses call so the allowed-ID prompt and request overhead are paid once.
+    Returns one dict per screenshot, in input order.
+    """
+    if not screenshot_data_urls:
+        return []
+
+    client = _client(api_key)
+
+    blocks = _prompt_blocks(set_patch, tuple(champion_ids), tuple(item_ids))
+    n = len(screenshot_data_urls)
+
+    resp = client.responses.parse(
+        model=model,
+        input=[
+            {
+                "role": "system",
+                "content": (
+                    "You extract structured TFT game-state data from screenshots. "
+                    f"You will receive {n} screenshots; return exactly {n} entries in `items`, "
+                    "one per screenshot, in the same order."
+                ),
+            },
+            {
+                "role": "user",
+                "content": [
+                    *({"type": "input_text", "text": b} for b in blocks),
+                    *({"type": "input_image", "image_url": url} for url in screenshot_data_urls),
+                ],
+            },
+        ],
+        text_format=GameStateBatch,
+    )
+
+    batch: GameStateBatch = resp.output_parsed  # type: ignore
+    if len(batch.items) != n:
+        raise ValueError(f"Vision batch returned {len(batch.items)} game states for {n} screenshots.")
+    return [gs.model_dump() for gs in batch.items]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import os
 
@@ -11,9 +12,9 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from tft_advisor.recommender import load_pack, recommend
-from tft_advisor.vision_capture import capture_monitor_png
-from tft_advisor.vision_reader import read_gamestate_from_screenshot
+from tft_advisor.recommender import cached_pack, recommend
+# vision_capture (mss/PIL) and vision_reader (openai/pydantic) are imported in the button
+# handlers that use them, so startup and sidebar-only sessions don't pay for them.
 
 
 DEFAULT_PACK = Path("data/set16_16.1")
@@ -40,9 +41,11 @@ section[data-testid="stSidebar"] > div { padding-top: 0.75rem; }
     )
 
 
-@st.cache_data
-def load_pack_cached(pack_dir_str: str):
-    return load_pack(Path(pack_dir_str))
+@st.cache_resource
+def capture_worker() -> ThreadPoolExecutor:
+    # Streamlit runs each rerun on a fresh thread, so vision_capture's per-thread MSS handle
+    # would be rebuilt on every click. One long-lived worker thread keeps it alive.
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="tft-capture")
 
 
 def main():
@@ -59,6 +62,14 @@ def main():
         st.divider()
         st.header("Capture")
         monitor_index = st.number_input("Monitor index (TFT fullscreen)", min_value=1, max_value=8, value=3, step=1)
+        region = None
+        if st.checkbox("Capture a region only", help="Grab just this rectangle (relative to the monitor), e.g. the game area on an ultrawide."):
+            rc = st.columns(2)
+            left_px = rc[0].number_input("Left", min_value=0, value=0, step=10)
+            top_px = rc[1].number_input("Top", min_value=0, value=0, step=10)
+            width_px = rc[0].number_input("Width", min_value=1, value=1920, step=10)
+            height_px = rc[1].number_input("Height", min_value=1, value=1080, step=10)
+            region = (int(left_px), int(top_px), int(width_px), int(height_px))
 
         st.divider()
         st.header("AI (OpenAI)")
@@ -75,9 +86,9 @@ def main():
         )
 
     # Load pack (for allowed IDs + recommend)
-    pack = load_pack_cached(pack_dir)
-    champ_ids = sorted(pack["champions"].keys())
-    item_ids = sorted(pack["items"].keys())
+    # same mtime-keyed cache recommend() uses: shared by reference, no per-rerun copy
+    pack = cached_pack(Path(pack_dir))
+    champ_ids, item_ids = pack["_allowed_ids"]  # sorted once per pack load
     set_patch = Path(pack_dir).name
 
     # Layout: left = screenshot + parsed JSON, right = recommendations
@@ -88,7 +99,9 @@ def main():
         cap_cols = st.columns([1, 1, 2])
         if cap_cols[0].button("Capture now", use_container_width=True):
             try:
-                cap = capture_monitor_png(int(monitor_index))
+                from tft_advisor.vision_capture import capture_monitor_png
+
+                cap = capture_worker().submit(capture_monitor_png, int(monitor_index), region=region).result()
                 st.session_state["last_capture"] = cap
                 st.success(f"Captured monitor {cap.monitor_index} ({cap.size[0]}x{cap.size[1]})")
             except Exception as e:
@@ -101,7 +114,7 @@ def main():
 
         cap = st.session_state.get("last_capture")
         if cap:
-            st.image(cap.png_bytes, caption=f"Monitor {cap.monitor_index} • {cap.size[0]}x{cap.size[1]}", use_container_width=True)
+            st.image(cap.preview_jpeg, caption=f"Monitor {cap.monitor_index} • {cap.size[0]}x{cap.size[1]}", use_container_width=True)
         else:
             st.info("Capture a screenshot from your TFT monitor.")
 
@@ -113,6 +126,8 @@ def main():
 
         if read_cols[0].button("Read with AI", use_container_width=True, disabled=not can_read):
             try:
+                from tft_advisor.vision_reader import read_gamestate_from_screenshot
+
                 gs = read_gamestate_from_screenshot(
                     api_key=api_key.strip(),
                     model=model.strip(),
@@ -171,16 +186,20 @@ def main():
                             msg = then.get("why") or then.get("message") or str(then)
                             st.info(msg)
 
-                    st.markdown("**Shop actions**")
-                    for a in card.get("shop_actions", []) or []:
-                        st.write(f"- **{a.get('action')}** `{a.get('champion_id')}` — {a.get('why','')}")
+                    # one markdown element per list instead of one st.write per line
+                    shop_lines = [
+                        f"- **{a.get('action')}** `{a.get('champion_id')}` — {a.get('why','')}"
+                        for a in card.get("shop_actions", []) or []
+                    ]
+                    st.markdown("\n".join(["**Shop actions**", "", *shop_lines]))
 
-                    st.markdown("**Item actions**")
+                    item_lines = []
                     for a in card.get("item_actions", []) or []:
                         line = f"- **{a.get('action')}** `{a.get('item_id')}` on `{a.get('now_holder')}`"
                         if a.get("final_holder") and a["final_holder"] != a["now_holder"]:
                             line += f" → final `{a.get('final_holder')}`"
-                        st.write(line)
+                        item_lines.append(line)
+                    st.markdown("\n".join(["**Item actions**", "", *item_lines]))
 
                     lp = card.get("level_plan_hint")
                     if lp: